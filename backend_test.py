@@ -2,314 +2,536 @@
 """
 Comprehensive Backend API Testing for Talk-To-My-Lawyer Application
 Tests all user roles: Subscriber, Employee, System Admin, Attorney Admin
+
+Requires: requests. Uses orjson for faster JSON handling when installed.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 import json
 import sys
+import base64
+import math
+import socket
 import time
-from datetime import datetime
-from typing import Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Union
+
+try:
+    import orjson
+    json_dumps, json_loads = orjson.dumps, orjson.loads
+except ImportError:
+    # orjson is optional; stdlib json produces the same bytes-in/bytes-out API
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    json_loads = json.loads
+
+# Upper bound on concurrent in-flight requests per batch; the connection
+# pool is sized to match so workers never wait on urllib3's pool queue
+MAX_WORKERS = 16
+
+# Unparsed bodies up to this size are still drained so the keep-alive
+# connection can return to the pool; larger ones are dropped unread
+DRAIN_LIMIT = 64 * 1024
+
+# Chunk size for reading streamed response bodies
+READ_CHUNK_SIZE = 16 * 1024
+
+# Parsed bodies larger than this are reported by status only
+MAX_BODY_BYTES = 1 << 20
+
+# Endpoint checks per role as (method, endpoint, test name, expected status,
+# canned body key, parse_body). parse_body is True only where the response
+# is read afterwards. 'public' checks run without a token.
+ENDPOINTS_BY_ROLE = {
+    'subscriber': [
+        ('GET',  'dashboard',            'Subscriber Dashboard',           200, None,            False),
+        ('GET',  'profile',              'Profile Settings',               200, None,            False),
+        ('POST', 'letters_generate',     'Letter Generation',              200, 'letter_demand', True),
+        ('GET',  'subscription',         'Subscription Status',            200, None,            False),
+    ],
+    'employee': [
+        # Employee dashboard (should redirect to commissions)
+        ('GET',  'employee_commissions', 'Employee Commissions Dashboard', 200, None,            False),
+        ('GET',  'employee_coupons',     'Employee Coupons',               200, None,            False),
+        ('GET',  'employee_settings',    'Employee Settings',              200, None,            False),
+    ],
+    'super_admin': [
+        ('GET',  'admin_dashboard',      'Admin Dashboard',                200, None,            False),
+        ('GET',  'admin_analytics',      'Admin Analytics',                200, None,            False),
+        ('GET',  'admin_users',          'User Management',                200, None,            False),
+        ('GET',  'admin_letters',        'All Letters',                    200, None,            False),
+        ('GET',  'admin_coupons',        'Coupon Management',              200, None,            False),
+        ('GET',  'admin_commissions',    'Commission Management',          200, None,            False),
+    ],
+    'attorney_admin': [
+        ('GET',  'attorney_review',      'Attorney Review Center',         200, None,            False),
+        ('GET',  'attorney_pending',     'Pending Letters',                200, None,            False),
+    ],
+    'public': [
+        ('GET',  'stripe_config',        'Stripe Configuration',           200, None,            False),
+        ('GET',  'subscription_plans',   'Subscription Plans',             200, None,            False),
+    ],
+}
+
+SWEEP_TITLES = {
+    'subscriber': "👤 Testing Subscriber Endpoints...",
+    'employee': "👷 Testing Employee Endpoints...",
+    'super_admin': "🔧 Testing System Admin Endpoints...",
+    'attorney_admin': "⚖️  Testing Attorney Admin Endpoints...",
+    'public': "💳 Testing Payment Endpoints...",
+}
+
+# Re-login this many seconds before a token's JWT 'exp' claim
+TOKEN_EXPIRY_MARGIN = 30
+
+def resolve_pointer(doc: Any, pointer: str) -> Any:
+    """Resolve a JSON pointer such as '/data/accessToken' against a parsed document"""
+    cur = doc
+    for part in pointer.lstrip('/').split('/'):
+        part = part.replace('~1', '/').replace('~0', '~')
+        cur = cur[int(part)] if isinstance(cur, list) else cur[part]
+    return cur
+
+def jwt_expiry(token: str) -> float:
+    """Return a JWT's 'exp' claim as a Unix timestamp, or infinity if it has none"""
+    try:
+        payload = token.split('.')[1]
+        claims = json_loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (AttributeError, IndexError, ValueError, KeyError, TypeError):
+        return math.inf
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets also enable TCP keep-alive
+
+    urllib3's defaults (which already include TCP_NODELAY) are kept.
+    """
+
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
 
 class TalkToMyLawyerAPITester:
+    # Every fixed endpoint the suite hits; URLs are resolved once per instance
+    ENDPOINTS = (
+        ('health',               '/api/health'),
+        ('health_detailed',      '/api/health/detailed'),
+        ('login',                '/api/auth/login'),
+        ('admin_login',          '/api/auth/admin-login'),
+        ('dashboard',            '/api/dashboard'),
+        ('profile',              '/api/profile'),
+        ('letters_generate',     '/api/letters/generate'),
+        ('letters',              '/api/letters'),
+        ('subscription',         '/api/subscription'),
+        ('employee_commissions', '/api/dashboard/commissions'),
+        ('employee_coupons',     '/api/dashboard/coupons'),
+        ('employee_settings',    '/api/dashboard/employee-settings'),
+        ('admin_dashboard',      '/api/secure-admin-gateway/dashboard'),
+        ('admin_analytics',      '/api/secure-admin-gateway/analytics'),
+        ('admin_users',          '/api/secure-admin-gateway/users'),
+        ('admin_letters',        '/api/secure-admin-gateway/letters'),
+        ('admin_coupons',        '/api/secure-admin-gateway/coupons'),
+        ('admin_commissions',    '/api/secure-admin-gateway/commissions'),
+        ('attorney_review',      '/api/attorney-portal/review'),
+        ('attorney_pending',     '/api/attorney-portal/letters/pending'),
+        ('stripe_config',        '/api/stripe/config'),
+        ('subscription_plans',   '/api/subscription/plans'),
+    )
+
+    # Constant request bodies, serialized once at import time
+    _CANNED_BODIES = {
+        'letter_demand': json_dumps({
+            'type': 'demand_letter',
+            'sender_name': 'Test User',
+            'sender_email': 'test@example.com',
+            'recipient_name': 'Test Recipient',
+            'issue_description': 'Test issue for API testing',
+            'desired_outcome': 'Test resolution'
+        })
+    }
+
     def __init__(self, base_url="https://www.talk-to-my-lawyer.com"):
         self.base_url = base_url
+        self._urls = {name: base_url + path for name, path in self.ENDPOINTS}
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'User-Agent': 'TalkToMyLawyer-APITester/1.0'
+            'User-Agent': 'TalkToMyLawyer-APITester/1.0',
+            'Connection': 'keep-alive'
         })
+        adapter = KeepAliveAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Verb -> bound session method; rebuild if self.session is replaced
+        self._verbs = {
+            'GET': self.session.get,
+            'POST': self.session.post,
+            'PUT': self.session.put,
+            'DELETE': self.session.delete
+        }
+        # One executor for the tester's lifetime so batches (and repeated
+        # runs) share warm worker threads; released by close()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
         
         # Test accounts as specified in the review request
         self.test_accounts = {
             'subscriber': {
                 'email': 'test-subscriber@ttml-test.com',
                 'password': 'TestPass123!',
-                'login_url': '/auth/login'
+                'login_url': '/auth/login',
+                'token_path': '/token'
             },
             'employee': {
                 'email': 'test-employee@ttml-test.com', 
                 'password': 'TestPass123!',
-                'login_url': '/auth/login'
+                'login_url': '/auth/login',
+                'token_path': '/token'
             },
             'super_admin': {
                 'email': 'test-superadmin@ttml-test.com',
                 'password': 'TestPass123!',
-                'login_url': '/secure-admin-gateway/login'
+                'login_url': '/secure-admin-gateway/login',
+                'token_path': '/token'
             },
             'attorney_admin': {
                 'email': 'test-attorney@ttml-test.com',
                 'password': 'TestPass123!', 
-                'login_url': '/attorney-portal/login'
+                'login_url': '/attorney-portal/login',
+                'token_path': '/token'
             }
         }
+        self._login_bodies = {
+            role: json_dumps({'email': account['email'], 'password': account['password']})
+            for role, account in self.test_accounts.items()
+        }
         
         self.tokens = {}
+        self._token_expiry = {}
+        self.auth_headers = {}
+        self._have = frozenset()
+        # Results are logged from the main thread; printing is deferred to _flush_log
+        self._log = deque()
         self.test_results = {
             'total': 0,
             'passed': 0,
             'failed': 0,
-            'errors': []
+            'errors': [],
+            'durations': []
         }
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test result"""
         self.test_results['total'] += 1
-        if success:
-            self.test_results['passed'] += 1
-            print(f"✅ {name}")
-            if details:
-                print(f"   {details}")
-        else:
-            self.test_results['failed'] += 1
-            print(f"❌ {name}")
-            if details:
-                print(f"   {details}")
-                self.test_results['errors'].append(f"{name}: {details}")
-
-    def make_request(self, method: str, endpoint: str, data: Dict = None, 
-                    headers: Dict = None, expected_status: int = 200) -> tuple[bool, Dict]:
-        """Make HTTP request and return success status and response data"""
-        url = f"{self.base_url}{endpoint}"
+        self.test_results['passed' if success else 'failed'] += 1
+        self._log.append((success, name, details))
+        if not success and details:
+            self.test_results['errors'].append(f"{name}: {details}")
+
+    def _flush_log(self):
+        """Write and drain buffered test results, one write per result"""
+        write = sys.stdout.write
+        while self._log:
+            success, name, details = self._log.popleft()
+            mark = "✅" if success else "❌"
+            write(f"{mark} {name}\n   {details}\n" if details else f"{mark} {name}\n")
+        sys.stdout.flush()
+
+    def make_request(self, method: str, endpoint: str, data: Optional[Union[Dict, bytes]] = None,
+                    headers: Dict = None, expected_status: int = 200,
+                    parse_body: bool = True, max_bytes: int = MAX_BODY_BYTES) -> tuple[bool, Dict]:
+        """Make HTTP request and return success status and response data
+
+        ``method`` must already be upper-case (e.g. 'GET', 'POST'). ``endpoint``
+        is an ENDPOINTS name or, for dynamic routes, a literal path starting
+        with '/'; unknown names raise KeyError. With ``parse_body=False``
+        only the status code is checked and returned;
+        bodies over ``max_bytes`` are not parsed and come back as
+        ``{'truncated': True, 'status_code': ...}``.
+        ``data`` may be pre-serialized JSON bytes, which are sent as-is.
+        """
+        # Literal paths are only for dynamic routes; an unknown name is a bug
+        url = self.base_url + endpoint if endpoint.startswith('/') else self._urls[endpoint]
         
         try:
-            if method.upper() == 'GET':
-                response = self.session.get(url, headers=headers)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, headers=headers)
-            elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data, headers=headers)
-            elif method.upper() == 'DELETE':
-                response = self.session.delete(url, headers=headers)
-            else:
+            fn = self._verbs.get(method)
+            if fn is None:
                 return False, {'error': f'Unsupported method: {method}'}
+            if method in ('POST', 'PUT'):
+                # Session already sends Content-Type: application/json
+                body = data if data is None or isinstance(data, bytes) else json_dumps(data)
+                response = fn(url, data=body, headers=headers, stream=True)
+            else:
+                response = fn(url, headers=headers, stream=True)
 
             success = response.status_code == expected_status
             
-            try:
-                response_data = response.json()
-            except:
-                response_data = {'status_code': response.status_code, 'text': response.text[:200]}
+            # Always release the streamed response, even if reading fails midway
+            with response:
+                if not parse_body:
+                    try:
+                        size = int(response.headers.get('content-length', ''))
+                    except ValueError:
+                        # Chunked, empty (204/304) or malformed: size unknown up front
+                        size = None
+                    # Drain small or unsized bodies with a bounded read so the
+                    # keep-alive connection goes back to the pool; close() drops
+                    # the connection only if bytes are still unread
+                    if size is None or size <= DRAIN_LIMIT:
+                        drained = 0
+                        for chunk in response.iter_content(READ_CHUNK_SIZE):
+                            drained += len(chunk)
+                            if drained > DRAIN_LIMIT:
+                                break
+                    return success, {'status_code': response.status_code}
+                
+                # Stop reading once the cap is exceeded; closing a partially read
+                # response drops the connection instead of downloading the rest
+                chunks, size = [], 0
+                for chunk in response.iter_content(READ_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > max_bytes:
+                        break
+            if size > max_bytes:
+                return success, {'truncated': True, 'status_code': response.status_code}
+            content = b''.join(chunks)
+            
+            # Only attempt JSON when the server says so; HTML error pages and
+            # empty bodies go straight to the text preview
+            if 'application/json' in response.headers.get('content-type', ''):
+                try:
+                    return success, json_loads(content)
+                except ValueError:
+                    # JSONDecodeError, or UnicodeDecodeError from stdlib json on non-UTF-8 bytes
+                    pass
+            response_data = {'status_code': response.status_code,
+                             'text': content[:200].decode('utf-8', 'replace')}
                 
             return success, response_data
             
         except Exception as e:
             return False, {'error': str(e)}
 
+    def _submit(self, calls: list) -> list:
+        """Start requests on the shared executor and return their futures
+
+        Each call is a (name, method, endpoint, data, headers, expected_status[, parse_body])
+        tuple; everything after the name is passed to make_request.
+        """
+        return [self._executor.submit(self._run_call, c) for c in calls]
+
+    def _run_call(self, call: tuple) -> tuple[bool, Dict]:
+        """Run one request described by a call tuple and record its latency in microseconds"""
+        t0 = time.monotonic_ns()
+        result = self.make_request(*call[1:])
+        self.test_results['durations'].append((call[0], (time.monotonic_ns() - t0) // 1000))
+        return result
+
+    def _collect(self, calls: list, futures: list, log: bool = True) -> list:
+        """Wait for submitted requests and return (and log) results in call order"""
+        results = [future.result() for future in futures]
+        
+        if log:
+            for call, (success, _) in zip(calls, results):
+                self.log_test(call[0], success)
+        return results
+
+    def _parallel(self, calls: list, log: bool = True) -> list:
+        """Dispatch independent requests concurrently and return results in call order"""
+        return self._collect(calls, self._submit(calls), log)
+
+    def _preflight(self):
+        """Open one connection to the origin before the parallel fan-out starts"""
+        try:
+            self.session.get(self._urls['health']).close()
+        except requests.RequestException:
+            # The health checks will report the failure
+            pass
+
     def test_health_endpoints(self):
         """Test basic health and status endpoints"""
         print("\n🔍 Testing Health Endpoints...")
         
-        # Test basic health check
-        success, data = self.make_request('GET', '/api/health')
+        (success, data), (detailed_success, _) = self._parallel([
+            ("Health Check", 'GET', 'health', None, None, 200),
+            ("Detailed Health Check", 'GET', 'health_detailed', None, None, 200, False),
+        ], log=False)
         self.log_test("Health Check", success, f"Status: {data.get('status', 'unknown')}")
-        
-        # Test detailed health check
-        success, data = self.make_request('GET', '/api/health/detailed')
-        self.log_test("Detailed Health Check", success)
+        self.log_test("Detailed Health Check", detailed_success)
 
     def test_authentication_endpoints(self):
         """Test authentication for all user types"""
         print("\n🔐 Testing Authentication Endpoints...")
         
-        for role, account in self.test_accounts.items():
-            print(f"\n  Testing {role} authentication...")
-            
-            # Test login endpoint
-            login_data = {
-                'email': account['email'],
-                'password': account['password']
-            }
-            
-            # For admin roles, we might need different login endpoints
-            if role in ['super_admin', 'attorney_admin']:
-                # These might require special admin portal authentication
-                success, response = self.make_request('POST', '/api/auth/admin-login', login_data)
-            else:
-                success, response = self.make_request('POST', '/api/auth/login', login_data)
-            
-            self.log_test(f"{role.title()} Login", success, 
-                         f"Response: {response.get('message', response.get('error', 'No message'))}")
-            
-            if success and 'token' in response:
-                self.tokens[role] = response['token']
+        # Logins are independent of each other, so all roles authenticate at once
+        calls = [self._login_call(role) for role in self.test_accounts]
+        results = self._parallel(calls, log=False)
+        for role, call, (success, response) in zip(self.test_accounts, calls, results):
+            details = f"Response: {response.get('message', response.get('error', 'No message'))}"
+            if success and not self._store_token(role, response):
+                # A login without a usable token cannot drive the role's sweeps
+                success = False
+                details += f" (no token at {self.test_accounts[role]['token_path']})"
+            self.log_test(call[0], success, details)
+        
+        self._refresh_auth_state()
 
-    def test_subscriber_endpoints(self):
-        """Test subscriber-specific endpoints"""
-        print("\n👤 Testing Subscriber Endpoints...")
-        
-        if 'subscriber' not in self.tokens:
-            print("⚠️  Skipping subscriber tests - no valid token")
-            return
-            
-        headers = {'Authorization': f'Bearer {self.tokens["subscriber"]}'}
-        
-        # Test dashboard access
-        success, data = self.make_request('GET', '/api/dashboard', headers=headers)
-        self.log_test("Subscriber Dashboard", success)
-        
-        # Test profile settings
-        success, data = self.make_request('GET', '/api/profile', headers=headers)
-        self.log_test("Profile Settings", success)
-        
-        # Test letter generation
-        letter_data = {
-            'type': 'demand_letter',
-            'sender_name': 'Test User',
-            'sender_email': 'test@example.com',
-            'recipient_name': 'Test Recipient',
-            'issue_description': 'Test issue for API testing',
-            'desired_outcome': 'Test resolution'
-        }
-        
-        success, response = self.make_request('POST', '/api/letters/generate', letter_data, headers)
-        self.log_test("Letter Generation", success)
-        
-        if success and 'letter_id' in response:
-            letter_id = response['letter_id']
-            
-            # Test letter retrieval
-            success, data = self.make_request('GET', f'/api/letters/{letter_id}', headers=headers)
-            self.log_test("Letter Retrieval", success)
-            
-            # Test letter list
-            success, data = self.make_request('GET', '/api/letters', headers=headers)
-            self.log_test("Letters List", success)
-        
-        # Test subscription endpoints
-        success, data = self.make_request('GET', '/api/subscription', headers=headers)
-        self.log_test("Subscription Status", success)
+    def _login_call(self, role: str) -> tuple:
+        """Build the login request for a role as a _parallel call tuple"""
+        # For admin roles, we might need different login endpoints
+        if role in ['super_admin', 'attorney_admin']:
+            # These might require special admin portal authentication
+            return (f"{role.title()} Login", 'POST', 'admin_login', self._login_bodies[role], None, 200)
+        return (f"{role.title()} Login", 'POST', 'login', self._login_bodies[role], None, 200)
 
-    def test_employee_endpoints(self):
-        """Test employee-specific endpoints"""
-        print("\n👷 Testing Employee Endpoints...")
-        
-        if 'employee' not in self.tokens:
-            print("⚠️  Skipping employee tests - no valid token")
-            return
-            
-        headers = {'Authorization': f'Bearer {self.tokens["employee"]}'}
-        
-        # Test employee dashboard (should redirect to commissions)
-        success, data = self.make_request('GET', '/api/dashboard/commissions', headers=headers)
-        self.log_test("Employee Commissions Dashboard", success)
-        
-        # Test coupon management
-        success, data = self.make_request('GET', '/api/dashboard/coupons', headers=headers)
-        self.log_test("Employee Coupons", success)
-        
-        # Test employee settings
-        success, data = self.make_request('GET', '/api/dashboard/employee-settings', headers=headers)
-        self.log_test("Employee Settings", success)
+    def _store_token(self, role: str, response: Dict) -> bool:
+        """Extract a role's token from a login response using its token_path"""
+        try:
+            token = resolve_pointer(response, self.test_accounts[role]['token_path'])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+        if not isinstance(token, str) or not token:
+            return False
+        self.tokens[role] = token
+        self._token_expiry[role] = jwt_expiry(token)
+        return True
 
-    def test_admin_endpoints(self):
-        """Test system admin endpoints"""
-        print("\n🔧 Testing System Admin Endpoints...")
-        
-        if 'super_admin' not in self.tokens:
-            print("⚠️  Skipping admin tests - no valid token")
-            return
-            
-        headers = {'Authorization': f'Bearer {self.tokens["super_admin"]}'}
-        
-        # Test admin dashboard
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/dashboard', headers=headers)
-        self.log_test("Admin Dashboard", success)
-        
-        # Test analytics
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/analytics', headers=headers)
-        self.log_test("Admin Analytics", success)
-        
-        # Test user management
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/users', headers=headers)
-        self.log_test("User Management", success)
-        
-        # Test all letters
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/letters', headers=headers)
-        self.log_test("All Letters", success)
-        
-        # Test coupon management
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/coupons', headers=headers)
-        self.log_test("Coupon Management", success)
-        
-        # Test commission management
-        success, data = self.make_request('GET', '/api/secure-admin-gateway/commissions', headers=headers)
-        self.log_test("Commission Management", success)
+    def _refresh_auth_state(self):
+        """Rebuild per-role auth headers and the set of testable roles from self.tokens"""
+        # Build each role's Authorization header once instead of per request;
+        # read-only so a request can never mutate the shared mapping
+        self.auth_headers = MappingProxyType({
+            role: MappingProxyType({'Authorization': f'Bearer {token}'})
+            for role, token in self.tokens.items()
+        })
+        # Roles whose checks can run; 'public' checks need no token
+        self._have = frozenset(self.tokens) | {'public'}
 
-    def test_attorney_admin_endpoints(self):
-        """Test attorney admin endpoints"""
-        print("\n⚖️  Testing Attorney Admin Endpoints...")
-        
-        if 'attorney_admin' not in self.tokens:
-            print("⚠️  Skipping attorney admin tests - no valid token")
+    def _ensure_token(self, role: str):
+        """Log a role in again if its token is about to expire"""
+        if time.time() <= self._token_expiry.get(role, math.inf) - TOKEN_EXPIRY_MARGIN:
             return
             
-        headers = {'Authorization': f'Bearer {self.tokens["attorney_admin"]}'}
-        
-        # Test attorney review center
-        success, data = self.make_request('GET', '/api/attorney-portal/review', headers=headers)
-        self.log_test("Attorney Review Center", success)
-        
-        # Test pending letters
-        success, data = self.make_request('GET', '/api/attorney-portal/letters/pending', headers=headers)
-        self.log_test("Pending Letters", success)
+        call = self._login_call(role)
+        success, response = self._run_call(call)
+        if not (success and self._store_token(role, response)):
+            # Recorded as a failure so the skipped sweep shows up in the summary
+            self.log_test(f"{call[0]} Refresh", False,
+                          f"Could not refresh token: {response.get('message', response.get('error', 'No message'))}")
+            self.tokens.pop(role, None)
+            self._token_expiry.pop(role, None)
+        self._refresh_auth_state()
 
-    def test_payment_endpoints(self):
-        """Test payment-related endpoints"""
-        print("\n💳 Testing Payment Endpoints...")
-        
-        # Test Stripe configuration
-        success, data = self.make_request('GET', '/api/stripe/config')
-        self.log_test("Stripe Configuration", success)
-        
-        # Test subscription plans
-        success, data = self.make_request('GET', '/api/subscription/plans')
-        self.log_test("Subscription Plans", success)
+    def _run_role_sweep(self, role: str):
+        """Run every endpoint check listed for a role in ENDPOINTS_BY_ROLE"""
+        assert role in self._have
+        
+        headers = self.auth_headers.get(role)
+        
+        calls = [(name, method, endpoint, self._CANNED_BODIES.get(body), headers, expected, parse_body)
+                 for method, endpoint, name, expected, body, parse_body in ENDPOINTS_BY_ROLE[role]]
+        futures = self._submit(calls)
+        
+        # Letter follow-ups start as soon as generation returns, overlapping
+        # with whatever is still in flight from the main batch
+        follow_ups = []
+        for call, future in zip(calls, futures):
+            if call[2] == 'letters_generate':
+                follow_ups += self._letter_follow_ups(future.result(), headers)
+        follow_up_futures = self._submit(follow_ups)
+        
+        self._collect(calls, futures)
+        self._collect(follow_ups, follow_up_futures)
+
+    def _letter_follow_ups(self, result: tuple, headers: Dict) -> list:
+        """Build retrieval and listing checks for a successfully generated letter"""
+        success, response = result
+        if not success or 'letter_id' not in response:
+            return []
+            
+        letter_id = response['letter_id']
+        return [
+            ("Letter Retrieval", 'GET', f'/api/letters/{letter_id}', None, headers, 200, False),
+            ("Letters List", 'GET', 'letters', None, headers, 200, False),
+        ]
 
     def test_role_access_control(self):
         """Test role-based access control"""
-        print("\n🛡️  Testing Role Access Control...")
-        
         # Test that attorney admin cannot access system admin endpoints
-        if 'attorney_admin' in self.tokens:
-            headers = {'Authorization': f'Bearer {self.tokens["attorney_admin"]}'}
-            
-            # Should be forbidden
-            success, data = self.make_request('GET', '/api/secure-admin-gateway/analytics', 
-                                            headers=headers, expected_status=403)
-            self.log_test("Attorney Admin Blocked from Analytics", success)
-            
-            success, data = self.make_request('GET', '/api/secure-admin-gateway/users', 
-                                            headers=headers, expected_status=403)
-            self.log_test("Attorney Admin Blocked from User Management", success)
+        assert 'attorney_admin' in self._have
+        headers = self.auth_headers['attorney_admin']
+        
+        # Should be forbidden
+        for call in (
+            ("Attorney Admin Blocked from Analytics", 'GET', 'admin_analytics', None, headers, 403, False),
+            ("Attorney Admin Blocked from User Management", 'GET', 'admin_users', None, headers, 403, False),
+        ):
+            success, data = self._run_call(call)
+            self.log_test(call[0], success)
 
     def run_all_tests(self):
         """Run comprehensive test suite"""
         print("🚀 Starting Talk-To-My-Lawyer API Testing Suite")
         print(f"🌐 Testing against: {self.base_url}")
-        print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"⏰ Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
         try:
-            self.test_health_endpoints()
-            self.test_authentication_endpoints()
-            self.test_subscriber_endpoints()
-            self.test_employee_endpoints()
-            self.test_admin_endpoints()
-            self.test_attorney_admin_endpoints()
-            self.test_payment_endpoints()
-            self.test_role_access_control()
+            self._preflight()
+            for test in (self.test_health_endpoints, self.test_authentication_endpoints):
+                test()
+                self._flush_log()
+            
+            # Only schedule sweeps whose role authenticated
+            # Section headers come first so token refresh failures are
+            # reported under the section they affect
+            for role in ENDPOINTS_BY_ROLE:
+                print(f"\n{SWEEP_TITLES[role]}")
+                self._ensure_token(role)
+                self._flush_log()
+                if role in self._have:
+                    self._run_role_sweep(role)
+                    self._flush_log()
+                else:
+                    print(f"⚠️  Skipping {role} tests - no valid token")
+            
+            print("\n🛡️  Testing Role Access Control...")
+            self._ensure_token('attorney_admin')
+            self._flush_log()
+            if {'attorney_admin'} <= self._have:
+                self.test_role_access_control()
+                self._flush_log()
+            else:
+                print("⚠️  Skipping role access control tests - no attorney_admin token")
             
         except KeyboardInterrupt:
+            self._flush_log()
             print("\n⚠️  Testing interrupted by user")
         except Exception as e:
+            self._flush_log()
             print(f"\n❌ Unexpected error during testing: {str(e)}")
             self.test_results['errors'].append(f"Unexpected error: {str(e)}")
+        finally:
+            self.session.close()
         
         self.print_summary()
 
+    def close(self):
+        """Release the worker threads and pooled connections"""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
     def print_summary(self):
         """Print test results summary"""
+        self._flush_log()
         print("\n" + "=" * 60)
         print("📊 TEST RESULTS SUMMARY")
         print("=" * 60)
@@ -326,19 +548,30 @@ class TalkToMyLawyerAPITester:
             success_rate = (passed / total) * 100
             print(f"📈 Success Rate: {success_rate:.1f}%")
         
+        durations = sorted(self.test_results['durations'], key=lambda d: d[1])
+        if durations:
+            p50 = durations[len(durations) // 2][1]
+            p95 = durations[min(len(durations) - 1, len(durations) * 95 // 100)][1]
+            slowest_name, slowest = durations[-1]
+            print(f"⏱️  Latency: p50 {p50 / 1000:.0f}ms, p95 {p95 / 1000:.0f}ms, "
+                  f"max {slowest / 1000:.0f}ms ({slowest_name})")
+        
         if self.test_results['errors']:
             print(f"\n🔍 FAILED TESTS:")
             for error in self.test_results['errors']:
                 print(f"   • {error}")
         
-        print(f"\n⏰ Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"\n⏰ Completed at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
         
         return failed == 0
 
 def main():
     """Main test execution"""
     tester = TalkToMyLawyerAPITester()
-    success = tester.run_all_tests()
+    try:
+        success = tester.run_all_tests()
+    finally:
+        tester.close()
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)